@@ -0,0 +1,303 @@
+"""Headless read-only HTTP API for the UCUP dashboard results.
+
+Memakai fungsi perhitungan yang sama dengan halaman Streamlit (ucup.mangrove,
+ucup.flood, ucup.water) dan cache yang sama (ucup.cache). ETag diturunkan dari
+cache key dan hanya dikirim untuk hasil yang sudah tersimpan, jadi polling ulang
+dengan ``If-None-Match`` cukup dijawab 304 tanpa menyentuh Earth Engine.
+
+Jalankan:  python api.py --port 8600
+
+Endpoint (semua GET, parameter opsional ``aoi``, ``format=json|parquet``):
+
+    /aois
+    /mangrove/area?year=2024&min_mvi=2.5&max_mvi=20
+    /mangrove/area/batch
+    /mangrove/change?start=2020&end=2024
+    /flood/classes?year=2024
+    /flood/classes/batch
+    /water/ndti-histogram?year=2024&cloud=10
+    /water/ndti-histogram/batch
+    /tiles/<raster_id>/<z>/<x>/<y>.png   (tile PNG dari raster lokal, tanpa EE)
+
+Agar halaman memakai tile lokal, set ``UCUP_TILE_URL=http://localhost:8600``.
+"""
+
+import argparse
+import io
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ucup import cache
+from ucup.aoi import DEFAULT_AOI, get_registry
+from ucup.ee_session import init_ee_headless
+from ucup.flood import flood_class_counts, flood_class_counts_by_year
+from ucup.mangrove import DEFAULT_MAX_MVI, DEFAULT_MIN_MVI, YEARS, area_by_year, loss_gain
+from ucup.tiles import MAX_ZOOM, render_tile, valid_tile
+from ucup.water import DEFAULT_CLOUD_LIMIT, ndti_histogram_by_year
+
+TILE_PATH = re.compile(r"^/tiles/([0-9a-f]{40})/(\d+)/(\d+)/(\d+)\.png$")
+PARQUET_TYPES = ("application/vnd.apache.parquet", "application/x-parquet")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# PARAMETER
+def _one(query, name, cast, default):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return cast(values[-1])
+    except ValueError:
+        raise ApiError(400, f"parameter {name!r} tidak valid: {values[-1]!r}")
+
+
+def _year(query, name, default=None):
+    value = _one(query, name, int, default)
+    if value is None:
+        raise ApiError(400, f"parameter {name!r} wajib diisi")
+    if value not in YEARS:
+        raise ApiError(400, f"{name} harus salah satu dari {YEARS}")
+    return value
+
+
+def _mvi_range(query):
+    return _one(query, "min_mvi", float, DEFAULT_MIN_MVI), _one(query, "max_mvi", float, DEFAULT_MAX_MVI)
+
+
+def _cloud(query):
+    return _one(query, "cloud", int, DEFAULT_CLOUD_LIMIT)
+
+
+# ROUTES
+# Tiap route: query → (params, compute). ``params`` ikut membentuk cache key,
+# sehingga ETag sudah bisa dihitung sebelum ada perhitungan apa pun.
+def _mangrove_area(aoi, query):
+    year = _year(query, "year")
+    min_mvi, max_mvi = _mvi_range(query)
+    return [year, min_mvi, max_mvi], lambda: area_by_year(aoi, [year], min_mvi, max_mvi)
+
+
+def _mangrove_area_batch(aoi, query):
+    min_mvi, max_mvi = _mvi_range(query)
+    return [min_mvi, max_mvi], lambda: area_by_year(aoi, min_mvi=min_mvi, max_mvi=max_mvi)
+
+
+def _mangrove_change(aoi, query):
+    start = _year(query, "start", 2020)
+    end = _year(query, "end", 2024)
+    min_mvi, max_mvi = _mvi_range(query)
+    return [start, end, min_mvi, max_mvi], lambda: loss_gain(aoi, start, end, min_mvi, max_mvi)
+
+
+def _flood_classes(aoi, query):
+    year = _year(query, "year")
+    return [year], lambda: flood_class_counts(aoi, year)
+
+
+def _flood_classes_batch(aoi, query):
+    return [], lambda: flood_class_counts_by_year(aoi)
+
+
+def _ndti_histogram(aoi, query):
+    year = _year(query, "year")
+    cloud = _cloud(query)
+    return [year, cloud], lambda: ndti_histogram_by_year(aoi, [year], cloud)
+
+
+def _ndti_histogram_batch(aoi, query):
+    cloud = _cloud(query)
+    return [cloud], lambda: ndti_histogram_by_year(aoi, cloud_limit=cloud)
+
+
+ROUTES = {
+    "/mangrove/area": _mangrove_area,
+    "/mangrove/area/batch": _mangrove_area_batch,
+    "/mangrove/change": _mangrove_change,
+    "/flood/classes": _flood_classes,
+    "/flood/classes/batch": _flood_classes_batch,
+    "/water/ndti-histogram": _ndti_histogram,
+    "/water/ndti-histogram/batch": _ndti_histogram_batch,
+}
+
+
+def _list_aois():
+    rows = [
+        {"name": a.name, "label": a.label, "bounds": list(a.bounds)}
+        for a in get_registry().values()
+    ]
+    key = cache.make_key("api", "/aois", [a.fingerprint for a in get_registry().values()])
+    return key, lambda: rows
+
+
+def resolve(path, query):
+    """(cache key, compute) untuk sebuah request; belum memanggil Earth Engine."""
+    path = path.rstrip("/") or "/"
+    if path == "/aois":
+        return _list_aois()
+
+    route = ROUTES.get(path)
+    if route is None:
+        raise ApiError(404, f"endpoint tidak dikenal: {path}")
+
+    aoi_name = _one(query, "aoi", str, DEFAULT_AOI)
+    aoi = get_registry().get(aoi_name)
+    if aoi is None:
+        raise ApiError(404, f"AOI tidak dikenal: {aoi_name!r}")
+
+    params, compute = route(aoi, query)
+    return cache.make_key("api", path, aoi.fingerprint, params), compute
+
+
+# ENCODING
+def wants_parquet(query, accept):
+    fmt = _one(query, "format", str, None)
+    if fmt is not None:
+        if fmt not in ("json", "parquet"):
+            raise ApiError(400, "format harus 'json' atau 'parquet'")
+        return fmt == "parquet"
+    return any(t in (accept or "") for t in PARQUET_TYPES)
+
+
+def encode(rows, parquet):
+    if parquet:
+        import pandas as pd
+
+        buf = io.BytesIO()
+        pd.DataFrame(rows).to_parquet(buf, index=False)
+        return PARQUET_TYPES[0], buf.getvalue()
+    return "application/json", json.dumps({"data": rows}).encode("utf-8")
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+# HANDLER
+class Handler(BaseHTTPRequestHandler):
+    server_version = "UCUP-API/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+
+        tile = TILE_PATH.match(url.path)
+        if tile:
+            self._send_tile(*tile.groups())
+            return
+
+        try:
+            key, compute = resolve(url.path, query)
+            parquet = wants_parquet(query, self.headers.get("Accept"))
+            # format ikut ETag karena representasinya berbeda
+            etag = f'"{key}{"-pq" if parquet else ""}"'
+
+            # ETag mewakili hasil yang tersimpan: 304 hanya bila hasilnya masih ada di cache
+            rows = cache.get(key)
+            if rows is not None and etag_matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                return
+
+            if rows is None:
+                rows = cache.put(key, compute())
+        except ApiError as e:
+            self._send_error(e.status, str(e))
+            return
+        except Exception as e:
+            self.log_error("gagal memproses %s: %r", self.path, e)
+            self._send_error(502, "perhitungan Earth Engine gagal")
+            return
+
+        try:
+            content_type, body = encode(rows, parquet)
+        except Exception as e:
+            self.log_error("gagal meng-encode %s: %r", self.path, e)
+            self._send_error(500, f"gagal membuat respons {'parquet' if parquet else 'JSON'}")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_tile(self, rid, z, x, y):
+        z, x, y = int(z), int(x), int(y)
+        if not valid_tile(z, x, y):
+            self._send_error(400, f"tile di luar jangkauan: perlu 0 <= z <= {MAX_ZOOM} dan 0 <= x, y < 2**z")
+            return
+
+        # raster per id tidak pernah berubah, jadi tile boleh di-cache lama oleh browser
+        etag = f'"{rid}-{z}-{x}-{y}"'
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        try:
+            body = render_tile(rid, z, x, y)
+        except KeyError:
+            self._send_error(404, f"raster tidak ada di cache lokal: {rid}")
+            return
+        except Exception as e:
+            self.log_error("gagal merender %s: %r", self.path, e)
+            self._send_error(500, "gagal merender tile")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=86400")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UCUP read-only results API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+
+    # hasil yang sudah di-cache dan tile lokal tetap dilayani walau EE gagal
+    try:
+        init_ee_headless()
+    except Exception as e:
+        print(f"Peringatan: Earth Engine tidak tersedia, hanya cache yang dilayani ({e})")
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"UCUP API berjalan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Cold-start import time per page.
+
+Import di tiap halaman dibagi dua:
+
+- ``selalu``: import di tingkat atas skrip atau di dalam blok ``with``, yang
+  dijalankan setiap kali halaman dibuka;
+- ``maks``: ditambah import di dalam ``if``/``try``/fungsi, yang hanya
+  dijalankan bila cabangnya dilewati (mis. pandas & plotly untuk histogram).
+
+Masing-masing dijalankan di interpreter Python yang baru, lalu waktunya diukur
+dalam milidetik. Import yang dilakukan modul ``ucup`` ikut terhitung karena
+modul itu benar-benar diimpor. Dengan ``--against REV`` halaman yang sama dari
+revisi git lain ikut diukur, jadi perbandingan sebelum/sesudah ada di satu
+tabel.
+
+Jalankan dari root repo:  python benchmarks/import_time.py [--repeat 5] [--against REV]
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_RUNNER = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+try:
+    exec({code!r})
+    print(json.dumps({{"ms": (time.perf_counter() - t0) * 1000}}))
+except ImportError as e:
+    print(json.dumps({{"missing": e.name or str(e)}}))
+"""
+
+_IMPORTS = (ast.Import, ast.ImportFrom)
+
+
+def page_files(root=ROOT):
+    pages = ["Home.py"]
+    pages_dir = os.path.join(root, "pages")
+    pages += [os.path.join("pages", f) for f in sorted(os.listdir(pages_dir)) if f.endswith(".py")]
+    return pages
+
+
+def page_imports(path):
+    """(import yang selalu jalan, semua import) sebagai kode Python."""
+    with open(path, "r", encoding="utf-8") as fp:
+        tree = ast.parse(fp.read(), filename=path)
+
+    found = []
+
+    def visit(node, conditional):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _IMPORTS):
+                found.append((child.lineno, conditional, ast.unparse(child)))
+            else:
+                # hanya blok ``with`` yang selalu dijalankan seperti tingkat atas
+                visit(child, conditional or not isinstance(child, (ast.With, ast.AsyncWith)))
+
+    visit(tree, False)
+    found.sort()
+    always = "\n".join(code for _, conditional, code in found if not conditional)
+    every = "\n".join(code for _, _, code in found)
+    return always, every
+
+
+def measure(code, repeat, root=ROOT):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _RUNNER.format(root=root, code=code)],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if "missing" in result:
+            return None, result["missing"]
+        samples.append(result["ms"])
+    return statistics.median(samples), None
+
+
+def checkout(rev, dest):
+    """Salin isi revisi git ke ``dest`` tanpa menyentuh working tree."""
+    with tempfile.TemporaryFile() as buf:
+        subprocess.run(["git", "archive", rev], cwd=ROOT, stdout=buf, check=True)
+        buf.seek(0)
+        with tarfile.open(fileobj=buf) as tar:
+            tar.extractall(dest)
+
+
+def page_times(root, name, repeat):
+    path = os.path.join(root, name)
+    if not os.path.exists(path):
+        return None
+    return [measure(code, repeat, root) for code in page_imports(path)]
+
+
+def _cell(result):
+    if result is None:
+        return f"{'-':>9}"
+    ms, missing = result
+    return f"{'n/a':>9}" if ms is None else f"{ms:>9.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--against", metavar="REV", help="bandingkan dengan revisi git ini")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.against:
+            checkout(args.against, tmp)
+
+        header = f"{'page':<34} {'selalu':>9} {'maks':>9}"
+        if args.against:
+            header += f"   {args.against[:10] + ':':<11}{'selalu':>9} {'maks':>9}"
+        print(header + "   (ms)")
+
+        missing = set()
+        for name in page_files():
+            now = page_times(ROOT, name, args.repeat)
+            line = f"{name:<34} {_cell(now[0])} {_cell(now[1])}"
+            results = list(now)
+            if args.against:
+                before = page_times(tmp, name, args.repeat) or [None, None]
+                line += f"   {'':<11}{_cell(before[0])} {_cell(before[1])}"
+                results += before
+            missing.update(r[1] for r in results if r is not None and r[1])
+            print(line)
+
+    if missing:
+        print(f"\nn/a = modul tidak terpasang: {', '.join(sorted(missing))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,10 @@
-import ee
 import streamlit as st
-import geemap.foliumap as geemap
-import pandas as pd
-import plotly.express as px
-import json
-import tempfile
-import os
 
-# INIT GEE DARI SERVICE ACCOUNT
-@st.cache_resource
-def init_ee_service_account():
-    try:
-        sa_json_str = st.secrets["gee"]["service_account_json"]
-        sa_info = json.loads(sa_json_str)
-
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as fp:
-            json.dump(sa_info, fp)
-            key_file_path = fp.name
-
-        credentials = ee.ServiceAccountCredentials(
-            email=sa_info["client_email"],
-            key_file=key_file_path,
-        )
-
-        ee.Initialize(credentials, project=sa_info["project_id"])
-        os.remove(key_file_path)
-        return True
-
-    except Exception as e:
-        st.error(f"❌ Gagal menginisialisasi Google Earth Engine:\n\n{e}")
-        st.stop()
+from ucup.aoi import get_registry
+from ucup.ee_session import init_ee_service_account
+from ucup.water import YEARS, get_ndwi_ndti, ndti_histogram, ndti_vis, ndwi_vis
 
+# INIT GEE DARI SERVICE ACCOUNT
 init_ee_service_account()
 
 # PAGE HEADER
@@ -46,18 +20,18 @@ st.markdown(
     """
 )
 
-# AOI
-AOI = ee.Geometry.Polygon([[
-    [106.7535685, -6.1066100],
-    [106.7771719, -6.1066100],
-    [106.7771719, -6.0886875],
-    [106.7535685, -6.0886875],
-]])
-
 # SIDEBAR FILTERS
 st.sidebar.header("⚙️ Pengaturan Turbiditas")
 
-year = st.sidebar.selectbox("Pilih Tahun", [2020, 2021, 2022, 2023, 2024], index=4)
+# AOI
+aoi_registry = get_registry()
+aoi_name = st.sidebar.selectbox(
+    "Pilih AOI", list(aoi_registry), format_func=lambda n: aoi_registry[n].label
+)
+AOI_INFO = aoi_registry[aoi_name]
+AOI = AOI_INFO.ee_geometry()
+
+year = st.sidebar.selectbox("Pilih Tahun", YEARS, index=4)
 
 cloud_thresh = st.sidebar.slider(
     "Cloud Max (%)", 0, 30, 10, 1
@@ -69,47 +43,22 @@ layer_type = st.sidebar.radio(
     index=1
 )
 
-# AMBIL NDWI & NDTI
-def get_ndwi_ndti(year, cloud_limit=10):
-    s2 = (
-        ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
-        .filterBounds(AOI)
-        .filterDate(f"{year}-01-01", f"{year}-12-31")
-        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", cloud_limit))
-        .median()
-        .clip(AOI)
-    )
-
-    green = s2.select("B3")
-    red   = s2.select("B4")
-    nir   = s2.select("B8")
-
-    ndwi = green.subtract(nir).divide(green.add(nir).add(1e-6)).rename("NDWI")
-
-    watermask = ndwi.gt(0).rename("watermask")
-
-    ndti = red.subtract(green).divide(red.add(green).add(1e-6)).rename("NDTI")
-    ndti_water = ndti.updateMask(watermask).clip(AOI)
-
-    return ndwi, ndti_water, watermask
-
-ndwi_img, ndti_img, watermask = get_ndwi_ndti(year, cloud_limit=cloud_thresh)
+ndwi_img, ndti_img, watermask = get_ndwi_ndti(AOI, year, cloud_limit=cloud_thresh)
 
 # PETA INTERAKTIF
 st.subheader(f"🗺️ Peta NDWI / NDTI – Tahun {year}")
 
-m = geemap.Map(center=[-6.098, 106.765], zoom=15)
-m.add_basemap("CartoDB.DarkMatter")
-m.addLayer(AOI, {"color": "yellow"}, "AOI")
+from ucup.webmap import Map, add_aoi_outline, add_layer
 
-ndwi_vis = {"min": -0.5, "max": 0.5, "palette": ["red", "white", "blue"]}
-ndti_vis = {"min": -0.5, "max": 0.5, "palette": ["blue", "green", "yellow", "orange", "red"]}
+m = Map(center=AOI_INFO.center, zoom=AOI_INFO.zoom)
+m.add_basemap("CartoDB.DarkMatter")
+add_aoi_outline(m, AOI_INFO, "yellow")
 
 if layer_type.startswith("NDWI"):
-    m.addLayer(ndwi_img, ndwi_vis, f"NDWI {year}")
+    add_layer(m, AOI_INFO, ndwi_img, f"ndwi:{year}:{cloud_thresh}", ndwi_vis, f"NDWI {year}")
     legend = {"Dry": "red", "Neutral": "white", "Wet": "blue"}
 else:
-    m.addLayer(ndti_img, ndti_vis, f"NDTI {year}")
+    add_layer(m, AOI_INFO, ndti_img, f"ndti:{year}:{cloud_thresh}", ndti_vis, f"NDTI {year}")
     legend = {"Low Turbidity": "blue", "Medium": "yellow", "High": "red"}
 
 m.add_legend(title=layer_type, legend_dict=legend)
@@ -118,16 +67,19 @@ m.to_streamlit(height=500)
 # HISTOGRAM NDTI
 st.subheader(f"📊 Histogram NDTI (Turbiditas) – {year}")
 
-hist_dict = ndti_img.reduceRegion(
-    reducer=ee.Reducer.histogram(maxBuckets=30),
-    geometry=AOI,
-    scale=10,
-    maxPixels=1e13,
-)
-
 try:
-    hist = ee.Dictionary(hist_dict.get("NDTI")).getInfo()
-    df = pd.DataFrame({"NDTI": hist["bucketMeans"], "Count": hist["histogram"]})
+    hist = ndti_histogram(ndti_img, AOI_INFO, year, cloud_limit=cloud_thresh)
+    # buang bucket kosong di kedua ujung
+    filled = [i for i, count in enumerate(hist["histogram"]) if count > 0]
+    if not filled:
+        raise ValueError("histogram kosong")
+    keep = slice(filled[0], filled[-1] + 1)
+
+    # pandas & plotly hanya diimpor bila memang ada grafik yang digambar
+    import pandas as pd
+    import plotly.express as px
+
+    df = pd.DataFrame({"NDTI": hist["bucketMeans"][keep], "Count": hist["histogram"][keep]})
 
     fig = px.bar(
         df,
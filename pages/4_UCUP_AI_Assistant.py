@@ -1,6 +1,10 @@
 import streamlit as st
-from groq import Groq
 import datetime
+import re
+import uuid
+
+from ucup.chat_store import ChatStore
+from ucup.llm_gateway import DEFAULT_RPM, DEFAULT_TPM, GatewayBusy, LlmGateway
 
 # PAGE UI
 st.title("🤖 UCUP AI Assistant")
@@ -15,30 +19,72 @@ st.markdown(
 
 st.divider()
 
-# INIT GROQ CLIENT
-def get_client():
+CHAT_WINDOW = 20        # pesan yang dirender per langkah "muat sebelumnya"
+CONTEXT_MESSAGES = None  # riwayat yang dikirim ke model; None = seluruh percakapan,
+                         # isi angka untuk membatasi ke N pesan terakhir
+
+# GROQ GATEWAY (satu per proses, dipakai bersama semua sesi)
+@st.cache_resource
+def get_gateway():
     try:
-        api_key = st.secrets["groq"]["api_key"]
-        return Groq(api_key=api_key)
+        groq_cfg = st.secrets["groq"]
+        api_key = groq_cfg["api_key"]
     except Exception:
         st.error("❌ Groq API key belum diatur di Secrets Streamlit.")
         st.stop()
 
-client = get_client()
+    return LlmGateway(
+        api_key=api_key,
+        base_url=groq_cfg.get("base_url"),
+        rpm=groq_cfg.get("rpm", DEFAULT_RPM),
+        tpm=groq_cfg.get("tpm", DEFAULT_TPM),
+    )
+
+gateway = get_gateway()
+
+# RIWAYAT CHAT PERSISTEN (SQLite, per session ID)
+@st.cache_resource
+def get_chat_store():
+    return ChatStore()
+
+store = get_chat_store()
+
+# session ID disimpan di URL (?chat=...) supaya reload memulihkan riwayat
+if "session_id" not in st.session_state:
+    chat_param = st.query_params.get("chat", "")
+    st.session_state.session_id = chat_param if re.fullmatch(r"[0-9a-f]{32}", chat_param) else uuid.uuid4().hex
+st.query_params["chat"] = st.session_state.session_id
+session_id = st.session_state.session_id
+
+# METRIK ANTRIAN
+with st.sidebar.expander("📶 Status antrian AI"):
+    stats = gateway.metrics()
+    st.metric("Antrian", stats["queue_depth"])
+    st.metric("Sedang diproses", stats["in_flight"])
+    st.metric("Rata-rata tunggu", f"{stats['wait_ms_avg']:.0f} ms")
+    st.caption(f"p95 tunggu: {stats['wait_ms_p95']:.0f} ms · ditolak: {stats['rejected']}")
 
 # TOMBOL RESET CHAT
 col1, col2 = st.columns([6, 1])
 with col2:
     if st.button("♻️ Reset"):
-        st.session_state.messages = []
+        # riwayat lama tetap tersimpan; cukup mulai percakapan baru
+        st.session_state.session_id = uuid.uuid4().hex
+        st.session_state.chat_window = CHAT_WINDOW
         st.rerun()
 
 # CHAT MEMORY
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+if "chat_window" not in st.session_state:
+    st.session_state.chat_window = CHAT_WINDOW
+
+hidden = store.count(session_id) - st.session_state.chat_window
+if hidden > 0:
+    if st.button(f"⬆️ Muat pesan sebelumnya ({hidden} disembunyikan)"):
+        st.session_state.chat_window += CHAT_WINDOW
+        st.rerun()
 
-# TAMPILKAN CHAT SEBELUMNYA
-for msg in st.session_state.messages:
+# TAMPILKAN CHAT SEBELUMNYA (hanya jendela terakhir)
+for msg in store.tail(session_id, st.session_state.chat_window):
     with st.chat_message(msg["role"]):
         st.markdown(msg["content"])
 
@@ -50,7 +96,7 @@ user_input = st.chat_input(placeholder_text)
 if user_input:
 
     # Tampilkan pesan user
-    st.session_state.messages.append({"role": "user", "content": user_input})
+    user_msg = {"role": "user", "content": user_input}
     with st.chat_message("user"):
         st.write(user_input)
 
@@ -58,30 +104,37 @@ if user_input:
     with st.chat_message("assistant"):
         with st.spinner("AI sedang menganalisis data…"):
 
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                temperature=0.25,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Kamu adalah **UCUP AI Assistant**, asisten lingkungan Muara Angke. "
-                            "Jawab dengan bahasa Indonesia atau bahasa menyesuaikan pengguna yang sangat jelas, sederhana, ramah, "
-                            "UCUP merupakan kepanjangan dari Urban Rob Risk,Cover Mangrove, Under Water Pollution"
-                            "dan terstruktur dalam poin-poin jika perlu.\n\n"
-                            "Fokus menjelaskan:\n"
-                            "- Mangrove & indeks MVI\n"
-                            "- Kualitas air (NDWI, NDTI)\n"
-                            "- Banjir rob (Flood Hazard Index)\n"
-                            "- Interpretasi nilai citra satelit\n"
-                            "- Data tahun 2020–2024\n\n"
-                            "Kamu adalah asisten yang asik bisa diajak untuk berbicara konteks apapun terutama lingkungan "
-                            "Bila pertanyaan tidak relevan, tetap tanggapi tapi arahkan kembali dengan sopan"
-                        ),
-                    },
-                    *st.session_state.messages,
-                ],
-            )
+            try:
+                future = gateway.submit(
+                    session_id,
+                    model="llama-3.3-70b-versatile",
+                    temperature=0.25,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": (
+                                "Kamu adalah **UCUP AI Assistant**, asisten lingkungan Muara Angke. "
+                                "Jawab dengan bahasa Indonesia atau bahasa menyesuaikan pengguna yang sangat jelas, sederhana, ramah, "
+                                "UCUP merupakan kepanjangan dari Urban Rob Risk,Cover Mangrove, Under Water Pollution"
+                                "dan terstruktur dalam poin-poin jika perlu.\n\n"
+                                "Fokus menjelaskan:\n"
+                                "- Mangrove & indeks MVI\n"
+                                "- Kualitas air (NDWI, NDTI)\n"
+                                "- Banjir rob (Flood Hazard Index)\n"
+                                "- Interpretasi nilai citra satelit\n"
+                                "- Data tahun 2020–2024\n\n"
+                                "Kamu adalah asisten yang asik bisa diajak untuk berbicara konteks apapun terutama lingkungan "
+                                "Bila pertanyaan tidak relevan, tetap tanggapi tapi arahkan kembali dengan sopan"
+                            ),
+                        },
+                        *store.tail(session_id, CONTEXT_MESSAGES),
+                        user_msg,
+                    ],
+                )
+                response = future.result()
+            except GatewayBusy:
+                st.warning("⏳ AI sedang sibuk melayani banyak pengguna. Coba kirim lagi sebentar.")
+                st.stop()
 
             ai_answer = response.choices[0].message.content
 
@@ -89,7 +142,7 @@ if user_input:
             st.markdown(ai_answer)
 
     # Simpan ke riwayat
-    st.session_state.messages.append({"role": "assistant", "content": ai_answer})
+    store.append(session_id, user_msg, {"role": "assistant", "content": ai_answer})
 
 
 
@@ -0,0 +1,23 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tes tidak pernah memanggil Earth Engine; bila earthengine-api tidak terpasang,
+# modul kosong cukup supaya ``import ee`` di ucup.* berhasil.
+try:
+    import ee  # noqa: F401
+except ImportError:
+    sys.modules["ee"] = types.ModuleType("ee")
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    from ucup import cache
+
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "_memory", {})
+    return tmp_path / "cache"
@@ -0,0 +1,58 @@
+from ucup.aoi import Aoi, _cell_inside, _cell_touches, get_aoi, split_tiles
+
+
+def _square(west, south, east, north, name="sq"):
+    ring = [[west, south], [east, south], [east, north], [west, north], [west, south]]
+    return Aoi(name=name, label=name, geometry={"type": "Polygon", "coordinates": [ring]})
+
+
+def test_split_tiles_small_aoi_covers_bbox_cells():
+    tiles = split_tiles(get_aoi("muara_angke"))
+    assert len(tiles) == 4
+    assert not any(t.inside for t in tiles)
+
+
+def test_split_tiles_drops_cells_outside_polygon():
+    # segitiga: setengah kotak 0..0.06 di bawah diagonal
+    tri = Aoi(
+        name="tri",
+        label="tri",
+        geometry={"type": "Polygon", "coordinates": [[[0, 0], [0.06, 0], [0.06, 0.06], [0, 0]]]},
+    )
+    cells = {(t.ix, t.iy) for t in split_tiles(tri, size=0.02)}
+    # 9 sel di bbox; 3 sel di atas diagonal tidak bersinggungan
+    assert cells == {(0, 0), (1, 0), (2, 0), (1, 1), (2, 1), (2, 2)}
+    inside = {(t.ix, t.iy) for t in split_tiles(tri, size=0.02) if t.inside}
+    assert inside == {(1, 0), (2, 0), (2, 1)}
+
+
+def test_split_tiles_coastal_aoi_only_touching_cells():
+    aoi = get_aoi("pesisir_teluk_jakarta")
+    tiles = split_tiles(aoi)
+    assert all(_cell_touches(aoi, t.bounds) for t in tiles)
+    # bbox berisi 189 sel, hanya 101 yang benar-benar beririsan dengan poligon
+    assert len(tiles) == 101
+
+
+def test_cell_inside_and_touches():
+    aoi = _square(0, 0, 0.1, 0.1)
+    assert _cell_inside(aoi, (0.02, 0.02, 0.04, 0.04))
+    assert _cell_touches(aoi, (0.02, 0.02, 0.04, 0.04))
+
+    # sel di tepi: beririsan tapi tidak seluruhnya di dalam
+    assert not _cell_inside(aoi, (0.09, 0.02, 0.11, 0.04))
+    assert _cell_touches(aoi, (0.09, 0.02, 0.11, 0.04))
+
+    # hanya menempel di tepi AOI → tidak beririsan
+    assert not _cell_touches(aoi, (0.1, 0.02, 0.12, 0.04))
+    assert not _cell_touches(aoi, (0.2, 0.2, 0.22, 0.22))
+
+
+def test_cell_inside_respects_holes():
+    outer = [[0, 0], [0.1, 0], [0.1, 0.1], [0, 0.1], [0, 0]]
+    hole = [[0.03, 0.03], [0.07, 0.03], [0.07, 0.07], [0.03, 0.07], [0.03, 0.03]]
+    aoi = Aoi(name="ring", label="ring", geometry={"type": "Polygon", "coordinates": [outer, hole]})
+
+    assert not _cell_touches(aoi, (0.04, 0.04, 0.06, 0.06))
+    assert not _cell_inside(aoi, (0.02, 0.02, 0.04, 0.04))
+    assert _cell_inside(aoi, (0.0, 0.0, 0.02, 0.02))
@@ -0,0 +1,147 @@
+import json
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import api
+from ucup import cache
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def area_by_year(aoi, years=None, min_mvi=None, max_mvi=None):
+        calls.append((aoi.name, years))
+        return [{"year": y, "area_ha": 1.5} for y in years or api.YEARS]
+
+    monkeypatch.setattr(api, "area_by_year", area_by_year)
+    return calls
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), api.Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_resolve_key_depends_on_params_and_aoi(calls):
+    key_a, _ = api.resolve("/mangrove/area", {"year": ["2024"]})
+    key_b, _ = api.resolve("/mangrove/area/", {"year": ["2024"]})
+    key_c, _ = api.resolve("/mangrove/area", {"year": ["2023"]})
+    key_d, _ = api.resolve("/mangrove/area", {"year": ["2024"], "aoi": ["pesisir_teluk_jakarta"]})
+    assert key_a == key_b
+    assert len({key_a, key_c, key_d}) == 3
+    assert calls == []  # resolve tidak menghitung apa pun
+
+
+@pytest.mark.parametrize("path, query, status", [
+    ("/tidak-ada", {}, 404),
+    ("/mangrove/area", {"aoi": ["atlantis"], "year": ["2024"]}, 404),
+    ("/mangrove/area", {}, 400),
+    ("/mangrove/area", {"year": ["1999"]}, 400),
+    ("/mangrove/area", {"year": ["abc"]}, 400),
+])
+def test_resolve_errors(path, query, status):
+    with pytest.raises(api.ApiError) as e:
+        api.resolve(path, query)
+    assert e.value.status == status
+
+
+def test_etag_matches():
+    assert api.etag_matches('"abc"', '"abc"')
+    assert api.etag_matches('"x", "abc"', '"abc"')
+    assert api.etag_matches('W/"abc"', '"abc"')
+    assert api.etag_matches("*", '"abc"')
+    assert not api.etag_matches('"x"', '"abc"')
+    assert not api.etag_matches(None, '"abc"')
+
+
+def test_http_200_then_304(server, calls):
+    status, headers, body = get(f"{server}/mangrove/area?year=2024")
+    assert status == 200
+    assert json.loads(body) == {"data": [{"year": 2024, "area_ha": 1.5}]}
+    etag = headers["ETag"]
+
+    status, headers, body = get(f"{server}/mangrove/area?year=2024", **{"If-None-Match": etag})
+    assert status == 304
+    assert headers["ETag"] == etag
+    assert body == b""
+    assert len(calls) == 1
+
+
+def test_http_etag_without_stored_result_recomputes(server, calls):
+    status, headers, _ = get(f"{server}/mangrove/area?year=2024")
+    etag = headers["ETag"]
+
+    # hasil hilang dari cache (memori & disk) → tidak boleh 304
+    cache._memory.clear()
+    shutil.rmtree(cache.CACHE_DIR)
+
+    status, _, body = get(f"{server}/mangrove/area?year=2024", **{"If-None-Match": etag})
+    assert status == 200
+    assert json.loads(body)["data"][0]["year"] == 2024
+    assert len(calls) == 2
+
+
+def test_http_errors(server):
+    assert get(f"{server}/mangrove/area?year=1999")[0] == 400
+    assert get(f"{server}/tidak-ada")[0] == 404
+    assert get(f"{server}/mangrove/area?year=2024&aoi=atlantis")[0] == 404
+
+
+def test_http_compute_and_encode_failures(server, calls, monkeypatch):
+    def encode(rows, parquet):
+        if parquet:
+            raise ImportError("pyarrow tidak terpasang")
+        return "application/json", b"{}"
+
+    monkeypatch.setattr(api, "encode", encode)
+    status, _, body = get(f"{server}/mangrove/area?year=2024&format=parquet")
+    assert status == 500
+    assert "parquet" in json.loads(body)["error"]
+    # hasil EE tetap tersimpan, jadi JSON bisa langsung dilayani
+    assert get(f"{server}/mangrove/area?year=2024")[0] == 200
+    assert len(calls) == 1
+
+    def area_by_year(aoi, years=None, min_mvi=None, max_mvi=None):
+        raise RuntimeError("EE timeout")
+
+    monkeypatch.setattr(api, "area_by_year", area_by_year)
+    assert get(f"{server}/mangrove/area?year=2023")[0] == 502
+
+
+def test_http_tiles(server, monkeypatch):
+    def render_tile(rid, z, x, y):
+        if rid == "a" * 40:
+            raise KeyError(rid)
+        if rid == "b" * 40:
+            raise RuntimeError("raster rusak")
+        return b"png"
+
+    monkeypatch.setattr(api, "render_tile", render_tile)
+    ok = "c" * 40
+
+    status, headers, body = get(f"{server}/tiles/{ok}/2/3/1.png")
+    assert (status, headers["Content-Type"], body) == (200, "image/png", b"png")
+    assert get(f"{server}/tiles/{ok}/3000/1/1.png")[0] == 400
+    assert get(f"{server}/tiles/{ok}/25/0/0.png")[0] == 400
+    assert get(f"{server}/tiles/{ok}/2/4/0.png")[0] == 400
+    assert get(f"{server}/tiles/{ok}/2/0/4.png")[0] == 400
+    assert get(f"{server}/tiles/{'a' * 40}/2/0/0.png")[0] == 404
+    assert get(f"{server}/tiles/{'b' * 40}/2/0/0.png")[0] == 500
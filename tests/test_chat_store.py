@@ -0,0 +1,60 @@
+import pytest
+
+from ucup.chat_store import ChatStore
+
+
+def msg(role, content):
+    return {"role": role, "content": content}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChatStore(str(tmp_path / "chat.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_append_assigns_sequence_per_session(store):
+    store.append("a", msg("user", "q1"), msg("assistant", "a1"))
+    store.append("b", msg("user", "lain"))
+    store.append("a", msg("user", "q2"))
+
+    rows = store._conn.execute(
+        "SELECT session_id, seq, content FROM messages ORDER BY session_id, seq"
+    ).fetchall()
+    assert rows == [("a", 1, "q1"), ("a", 2, "a1"), ("a", 3, "q2"), ("b", 1, "lain")]
+    assert store.count("a") == 3
+    assert store.count("b") == 1
+    assert store.count("kosong") == 0
+
+
+def test_tail_returns_last_messages_oldest_first(store):
+    for i in range(5):
+        store.append("a", msg("user", f"q{i}"), msg("assistant", f"a{i}"))
+
+    assert store.tail("a", 3) == [msg("assistant", "a3"), msg("user", "q4"), msg("assistant", "a4")]
+    assert [m["content"] for m in store.tail("a")] == [c for i in range(5) for c in (f"q{i}", f"a{i}")]
+    assert store.tail("a", 100) == store.tail("a")
+    assert store.tail("kosong") == []
+
+
+def test_failed_append_is_rolled_back(store):
+    store.append("a", msg("user", "q1"))
+    with pytest.raises(KeyError):
+        store.append("a", msg("user", "q2"), {"role": "assistant"})
+
+    assert store.count("a") == 1
+    store.append("a", msg("assistant", "a1"))
+    assert store.tail("a") == [msg("user", "q1"), msg("assistant", "a1")]
+
+
+def test_history_survives_reopen(tmp_path):
+    path = str(tmp_path / "chat.sqlite3")
+    first = ChatStore(path)
+    first.append("a", msg("user", "q1"))
+    first.close()
+
+    second = ChatStore(path)
+    second.append("a", msg("assistant", "a1"))
+    assert second.tail("a") == [msg("user", "q1"), msg("assistant", "a1")]
+    second.close()
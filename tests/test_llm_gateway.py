@@ -0,0 +1,163 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("groq")
+
+from ucup.llm_gateway import GatewayBusy, LlmGateway  # noqa: E402
+
+
+class FakeGroq:
+    """Server lokal yang meniru ``POST /openai/v1/chat/completions``.
+
+    Mencatat isi pesan terakhir dan waktu tiba tiap request. Selama ``gate``
+    belum di-set, request pertama ditahan supaya antrian gateway bisa diisi
+    dulu dengan urutan yang pasti.
+    """
+
+    def __init__(self):
+        self.seen = []
+        self.arrived = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                content = body["messages"][-1]["content"]
+                with fake._lock:
+                    fake.seen.append((content, time.monotonic()))
+                fake.arrived.set()
+                fake.gate.wait(10)
+
+                payload = json.dumps({
+                    "id": "fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "ok: " + content},
+                    }],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    @property
+    def order(self):
+        return [content for content, _ in self.seen]
+
+    def hold(self):
+        self.arrived.clear()
+        self.gate.clear()
+
+
+@pytest.fixture
+def groq_server():
+    server = FakeGroq()
+    threading.Thread(target=server.httpd.serve_forever, daemon=True).start()
+    yield server
+    server.gate.set()
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+@pytest.fixture
+def make_gateway(groq_server):
+    gateways = []
+
+    def make(**kwargs):
+        options = {"rpm": 6000, "tpm": 10_000_000, "concurrency": 1, "max_retries": 0, **kwargs}
+        gateway = LlmGateway(api_key="fake", base_url=groq_server.url, **options)
+        gateways.append(gateway)
+        return gateway
+
+    yield make
+    groq_server.gate.set()
+    for gateway in gateways:
+        gateway.close()
+
+
+def ask(gateway, session_id, text):
+    return gateway.submit(
+        session_id,
+        model="llama-3.3-70b-versatile",
+        messages=[{"role": "user", "content": text}],
+    )
+
+
+def test_sessions_are_served_round_robin(groq_server, make_gateway):
+    gateway = make_gateway()
+
+    # tahan satu request supaya seluruh antrian terisi sebelum worker memilih lagi
+    groq_server.hold()
+    first = ask(gateway, "blocker", "blocker")
+    assert groq_server.arrived.wait(5)
+
+    futures = [ask(gateway, "noisy", f"noisy#{i}") for i in range(6)]
+    for s in range(3):
+        futures += [ask(gateway, f"s{s}", f"s{s}#{i}") for i in range(2)]
+    groq_server.gate.set()
+
+    for f in [first, *futures]:
+        f.result(timeout=10)
+
+    assert groq_server.order == [
+        "blocker",
+        "noisy#0", "s0#0", "s1#0", "s2#0",
+        "noisy#1", "s0#1", "s1#1", "s2#1",
+        "noisy#2", "noisy#3", "noisy#4", "noisy#5",
+    ]
+    assert first.result().choices[0].message.content == "ok: blocker"
+    assert gateway.metrics()["completed"] == 13
+
+
+def test_full_queue_rejects_with_gateway_busy(groq_server, make_gateway):
+    gateway = make_gateway(max_queue=2)
+
+    groq_server.hold()
+    in_flight = ask(gateway, "a", "a#0")
+    assert groq_server.arrived.wait(5)
+
+    queued = [ask(gateway, "a", "a#1"), ask(gateway, "b", "b#0")]
+    with pytest.raises(GatewayBusy):
+        ask(gateway, "c", "c#0")
+
+    metrics = gateway.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["queue_depth"] == 2
+    assert metrics["submitted"] == 3
+
+    groq_server.gate.set()
+    for f in [in_flight, *queued]:
+        f.result(timeout=10)
+    assert "c#0" not in groq_server.order
+
+
+def test_low_rpm_delays_next_request(groq_server, make_gateway):
+    # 120 rpm tanpa burst: satu request tiap 0,5 detik
+    gateway = make_gateway(rpm=120, burst=1, concurrency=2)
+
+    futures = [ask(gateway, "a", "a#0"), ask(gateway, "b", "b#0")]
+    for f in futures:
+        f.result(timeout=10)
+
+    (_, t0), (_, t1) = groq_server.seen
+    assert t1 - t0 >= 0.4
@@ -0,0 +1,114 @@
+import json
+import math
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from ucup import rasters, tiles
+
+RID = "ab" * 20
+
+# raster 4x4 di lon 0..1, lat 0..1; nilai sel = baris * 4 + kolom, satu sel NaN
+META = {"west": 0.0, "north": 1.0, "res": 0.25, "width": 4, "height": 4,
+        "vis": {"min": 0, "max": 15, "palette": ["black", "white"]}}
+NAN_CELL = (3, 0)
+
+
+@pytest.fixture
+def raster(tmp_path, monkeypatch):
+    monkeypatch.setattr(rasters, "RASTER_DIR", str(tmp_path / "rasters"))
+    monkeypatch.setattr(rasters, "_open", {})
+    tiles.render_tile.cache_clear()
+
+    data = np.arange(16, dtype=np.float32).reshape(4, 4)
+    data[NAN_CELL] = np.nan
+    npy_path, meta_path = rasters._paths(RID)
+    (tmp_path / "rasters").mkdir()
+    np.save(npy_path, data)
+    with open(meta_path, "w", encoding="utf-8") as fp:
+        json.dump(META, fp)
+
+    yield data
+    tiles.render_tile.cache_clear()
+
+
+def decode_png(png):
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(png):
+        (length,) = struct.unpack(">I", png[pos:pos + 4])
+        tag, body = png[pos + 4:pos + 8], png[pos + 8:pos + 8 + length]
+        (crc,) = struct.unpack(">I", png[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(tag + body) & 0xFFFFFFFF
+        chunks[tag] = chunks.get(tag, b"") + body
+        pos += 12 + length
+
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, color_type) == (8, 6)
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, 1 + width * 4)
+    assert not raw[:, 0].any()  # filter 0 di setiap baris
+    return raw[:, 1:].reshape(height, width, 4)
+
+
+def test_colorize_interpolates_palette_and_masks_nan():
+    vis = {"min": 0, "max": 1, "palette": ["000000", "red", "#ffffff"]}
+    rgba = tiles.colorize(np.array([[0.0, 0.25, 0.5, 0.75, 2.0, np.nan]], dtype=np.float32), vis)
+
+    assert rgba[0, :, :3].tolist() == [
+        [0, 0, 0], [128, 0, 0], [255, 0, 0], [255, 128, 128], [255, 255, 255], [0, 0, 0],
+    ]
+    assert rgba[0, :, 3].tolist() == [255, 255, 255, 255, 255, 0]
+
+
+def test_encode_png_roundtrip():
+    rgba = np.random.default_rng(0).integers(0, 256, size=(3, 5, 4), dtype=np.uint8)
+    assert np.array_equal(decode_png(tiles.encode_png(rgba)), rgba)
+
+
+def test_valid_tile():
+    assert tiles.valid_tile(0, 0, 0)
+    assert tiles.valid_tile(24, 2 ** 24 - 1, 0)
+    assert not tiles.valid_tile(25, 0, 0)
+    assert not tiles.valid_tile(2, 4, 0)
+    assert not tiles.valid_tile(3000, 1, 1)
+
+
+def test_render_tile_maps_xyz_to_raster_cells(raster):
+    # tile z=8 (128, 127) mencakup lon 0..1.40625 dan lat 0..~1.406, jadi raster
+    # 1x1 derajat mengisi pojok kiri bawahnya
+    z, x, y = 8, 128, 127
+    rgba = decode_png(tiles.render_tile(RID, z, x, y))
+    assert rgba.shape == (256, 256, 4)
+
+    n = 2 ** z
+    expected = np.zeros((256, 256, 4), dtype=np.uint8)
+    for j in range(256):
+        lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + (j + 0.5) / 256) / n))))
+        row = math.floor((1.0 - lat) / 0.25)
+        for i in range(256):
+            lon = (x + (i + 0.5) / 256) / n * 360 - 180
+            col = math.floor(lon / 0.25)
+            if 0 <= row < 4 and 0 <= col < 4 and (row, col) != NAN_CELL:
+                gray = round(255 * raster[row, col] / 15)
+                expected[j, i] = (gray, gray, gray, 255)
+    assert np.array_equal(rgba, expected)
+
+    # raster menempati 182 kolom pertama dan baris bawah tile, sisanya transparan
+    opaque_cols = np.flatnonzero(rgba[..., 3].any(axis=0))
+    opaque_rows = np.flatnonzero(rgba[..., 3].any(axis=1))
+    assert (opaque_cols[0], opaque_cols[-1]) == (0, 181)
+    assert opaque_rows[-1] == 255 and 70 < opaque_rows[0] < 90
+    # sel NaN (baris 3, kolom 0) transparan di dalam area raster
+    assert rgba[255, 0, 3] == 0 and rgba[255, 100, 3] == 255
+
+
+def test_render_tile_outside_raster_is_empty(raster):
+    assert tiles.render_tile(RID, 8, 0, 0) is tiles.EMPTY_TILE
+    assert not decode_png(tiles.EMPTY_TILE)[..., 3].any()
+
+
+def test_render_tile_unknown_raster_raises_key_error(raster):
+    with pytest.raises(KeyError):
+        tiles.render_tile("cd" * 20, 8, 128, 127)
@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("folium")
+
+from ucup import webmap  # noqa: E402
+from ucup.aoi import get_aoi  # noqa: E402
+
+
+class RecordingMap:
+    def __init__(self):
+        self.calls = []
+
+    def addLayer(self, obj, vis, name):
+        self.calls.append(("ee", obj, name))
+
+    def add_tile_layer(self, url, name, attribution):
+        self.calls.append(("tiles", url, name))
+
+    def add_geojson(self, data, layer_name, style):
+        self.calls.append(("geojson", data["geometry"]["type"], layer_name))
+
+
+def test_add_layer_without_tile_server_uses_ee(monkeypatch):
+    monkeypatch.delenv(webmap.TILE_URL_ENV, raising=False)
+    m = RecordingMap()
+    webmap.add_layer(m, get_aoi(), "img", "k", {}, "NDTI")
+    assert m.calls == [("ee", "img", "NDTI")]
+
+
+def test_add_layer_with_tile_server_uses_local_raster(monkeypatch):
+    from ucup import rasters
+
+    monkeypatch.setenv(webmap.TILE_URL_ENV, "http://localhost:8600/")
+    monkeypatch.setattr(rasters, "ensure_raster", lambda aoi, image, key, vis, scale: "ab" * 20)
+    m = RecordingMap()
+    webmap.add_layer(m, get_aoi(), "img", "k", {}, "NDTI")
+    assert m.calls == [("tiles", f"http://localhost:8600/tiles/{'ab' * 20}/{{z}}/{{x}}/{{y}}.png", "NDTI")]
+
+
+def test_add_layer_falls_back_to_ee_when_raster_fails(monkeypatch, caplog):
+    from ucup import rasters
+
+    def ensure_raster(aoi, image, key, vis, scale):
+        raise RuntimeError("computePixels gagal")
+
+    monkeypatch.setenv(webmap.TILE_URL_ENV, "http://localhost:8600")
+    monkeypatch.setattr(rasters, "ensure_raster", ensure_raster)
+    m = RecordingMap()
+    webmap.add_layer(m, get_aoi(), "img", "k", {}, "NDTI")
+    assert m.calls == [("ee", "img", "NDTI")]
+    assert "computePixels gagal" in caplog.text
+
+
+def test_map_renders_tiles_outline_and_legend(monkeypatch):
+    monkeypatch.setenv(webmap.TILE_URL_ENV, "http://localhost:8600")
+    aoi = get_aoi()
+    m = webmap.Map(center=aoi.center, zoom=aoi.zoom)
+    m.add_tile_layer("http://localhost:8600/tiles/x/{z}/{x}/{y}.png", "NDTI 2024", "UCUP")
+    webmap.add_aoi_outline(m, aoi, "yellow")
+    m.add_legend(title="NDTI", legend_dict={"Low <1>": "blue", "High": "red"})
+
+    page = m.to_html()
+    assert "http://localhost:8600/tiles/x/{z}/{x}/{y}.png" in page
+    assert "NDTI 2024" in page
+    assert "Low &lt;1&gt;" in page
+    assert "yellow" in page
@@ -0,0 +1,99 @@
+import threading
+import types
+
+import pytest
+
+from ucup import zonal
+from ucup.aoi import Aoi, split_tiles
+
+
+@pytest.fixture
+def fake_reducer(monkeypatch):
+    reducer = types.SimpleNamespace(
+        fixedHistogram=lambda lo, hi, n: ("fixedHistogram", lo, hi, n),
+        sum=lambda: ("sum",),
+    )
+    monkeypatch.setattr(zonal, "ee", types.SimpleNamespace(Reducer=reducer))
+
+
+def _square(west, south, east, north, name):
+    ring = [[west, south], [east, south], [east, north], [west, north], [west, south]]
+    return Aoi(name=name, label=name, geometry={"type": "Polygon", "coordinates": [ring]})
+
+
+class _CountingImage:
+    """Pengganti ``ee.Image``: mencatat setiap reduceRegion per (sel, dalam/batas)."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def reduceRegion(self, reducer, geometry, scale, maxPixels):
+        with self._lock:
+            self.calls.append(geometry)
+        value = types.SimpleNamespace(getInfo=lambda: 1.0)
+        return types.SimpleNamespace(get=lambda band: value)
+
+
+def _fake_tiles(monkeypatch, values):
+    def reduce_tiles(kind, image, band, aoi, image_key, reducer, params, scale, tile_size):
+        return values
+
+    monkeypatch.setattr(zonal, "_reduce_tiles", reduce_tiles)
+
+
+def test_zonal_histogram_merges_bucket_counts(monkeypatch, fake_reducer):
+    _fake_tiles(monkeypatch, [
+        [[-1.0, 1.0], [0.0, 2.5]],
+        None,  # tile tanpa piksel
+        [[-1.0, 3.0], [0.0, 0.5]],
+    ])
+
+    hist = zonal.zonal_histogram(None, "NDTI", None, "k", lo=-1.0, hi=1.0, buckets=2)
+
+    assert hist["histogram"] == [4.0, 3.0]
+    assert hist["bucketMeans"] == [-0.5, 0.5]
+    assert hist["bucketMin"] == -1.0
+    assert hist["bucketWidth"] == 1.0
+
+
+def test_zonal_sum_adds_tiles_and_skips_empty(monkeypatch, fake_reducer):
+    _fake_tiles(monkeypatch, [1.5, None, 2.0])
+    assert zonal.zonal_sum(None, "mask", None, "k") == 3.5
+
+
+def test_overlapping_aois_reuse_inside_tiles(monkeypatch, fake_reducer):
+    # region palsu supaya tidak perlu ee.Geometry
+    def tile_region(aoi, tile):
+        return tile.cell_id, None if tile.inside else aoi.name
+
+    monkeypatch.setattr(zonal, "_tile_region", tile_region)
+
+    # sel dalam A: ix/iy 1..2, sel dalam B: ix/iy 2..3 → hanya sel (2, 2) yang sama-sama di dalam
+    a = _square(0.001, 0.001, 0.079, 0.079, "a")
+    b = _square(0.021, 0.021, 0.099, 0.099, "b")
+    image = _CountingImage()
+
+    assert zonal.zonal_sum(image, "mask", a, "img") == 16.0
+    assert zonal.zonal_sum(image, "mask", b, "img") == 16.0
+
+    shared = "0.02:2:2"
+    assert image.calls.count((shared, None)) == 1
+    assert len(image.calls) == 31
+
+    # sel batas di-key per AOI, sel dalam tanpa AOI
+    params = ["mask", 10, None]
+    tiles_a = {t.cell_id: t for t in split_tiles(a)}
+    tiles_b = {t.cell_id: t for t in split_tiles(b)}
+    key = zonal._tile_key
+    assert key("sum", a, tiles_a[shared], "img", params) == key("sum", b, tiles_b[shared], "img", params)
+    boundary = "0.02:1:1"  # dalam untuk A, batas untuk B
+    assert tiles_a[boundary].inside and not tiles_b[boundary].inside
+    assert key("sum", a, tiles_a[boundary], "img", params) != key("sum", b, tiles_b[boundary], "img", params)
+    both = "0.02:1:3"  # batas untuk keduanya
+    assert not tiles_a[both].inside and not tiles_b[both].inside
+    assert key("sum", a, tiles_a[both], "img", params) != key("sum", b, tiles_b[both], "img", params)
+
+    # hitung ulang AOI A sepenuhnya dari cache
+    zonal.zonal_sum(image, "mask", a, "img")
+    assert len(image.calls) == 31
@@ -0,0 +1 @@
+"""Shared helpers for the UCUP dashboard pages."""
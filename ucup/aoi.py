@@ -0,0 +1,189 @@
+"""AOI registry loaded from GeoJSON, plus the fixed tile grid used for zonal stats."""
+
+import json
+import math
+import os
+from dataclasses import dataclass
+
+DEFAULT_AOI_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "aoi.geojson")
+DEFAULT_AOI = "muara_angke"
+
+# Ukuran sel grid (derajat). Grid selalu menempel ke titik (0, 0) supaya
+# AOI yang saling tumpang tindih memakai sel yang sama persis.
+TILE_DEG = 0.02
+
+
+@dataclass(frozen=True)
+class Aoi:
+    name: str
+    label: str
+    geometry: dict  # GeoJSON Polygon / MultiPolygon
+
+    @property
+    def polygons(self):
+        if self.geometry["type"] == "Polygon":
+            return [self.geometry["coordinates"]]
+        return self.geometry["coordinates"]
+
+    @property
+    def rings(self):
+        return [ring for poly in self.polygons for ring in poly]
+
+    @property
+    def bounds(self):
+        xs = [x for ring in self.rings for x, _ in ring]
+        ys = [y for ring in self.rings for _, y in ring]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    @property
+    def center(self):
+        """[lat, lon] untuk webmap.Map(center=...)."""
+        west, south, east, north = self.bounds
+        return [(south + north) / 2, (west + east) / 2]
+
+    @property
+    def zoom(self):
+        west, south, east, north = self.bounds
+        span = max(east - west, north - south, 1e-6)
+        return min(15, round(math.log2(360 / span)) + 1)
+
+    @property
+    def fingerprint(self):
+        return json.dumps(self.geometry, sort_keys=True, separators=(",", ":"))
+
+    def ee_geometry(self):
+        import ee
+
+        return ee.Geometry(self.geometry)
+
+
+# REGISTRY
+_registry = {}
+
+
+def load_registry(path=DEFAULT_AOI_FILE):
+    with open(path, "r", encoding="utf-8") as fp:
+        collection = json.load(fp)
+
+    registry = {}
+    for feature in collection["features"]:
+        props = feature.get("properties") or {}
+        geometry = feature["geometry"]
+        if geometry["type"] not in ("Polygon", "MultiPolygon"):
+            raise ValueError(f"AOI {props.get('name')!r}: hanya Polygon/MultiPolygon yang didukung")
+        name = props["name"]
+        registry[name] = Aoi(name=name, label=props.get("label", name), geometry=geometry)
+    return registry
+
+
+def get_registry():
+    if not _registry:
+        _registry.update(load_registry())
+    return _registry
+
+
+def get_aoi(name=DEFAULT_AOI):
+    registry = get_registry()
+    if name not in registry:
+        raise KeyError(f"AOI tidak dikenal: {name!r} (tersedia: {', '.join(registry)})")
+    return registry[name]
+
+
+# TILE GRID
+@dataclass(frozen=True)
+class Tile:
+    ix: int
+    iy: int
+    size: float
+    inside: bool  # True bila sel seluruhnya berada di dalam AOI
+
+    @property
+    def bounds(self):
+        west = self.ix * self.size
+        south = self.iy * self.size
+        return west, south, west + self.size, south + self.size
+
+    @property
+    def cell_id(self):
+        return f"{self.size:g}:{self.ix}:{self.iy}"
+
+    def ee_rectangle(self):
+        import ee
+
+        return ee.Geometry.Rectangle(list(self.bounds), None, False)
+
+
+def split_tiles(aoi, size=TILE_DEG):
+    """Sel grid yang bersinggungan dengan AOI."""
+    west, south, east, north = aoi.bounds
+    tiles = []
+    for ix in range(math.floor(west / size), math.ceil(east / size)):
+        for iy in range(math.floor(south / size), math.ceil(north / size)):
+            cell = (ix * size, iy * size, (ix + 1) * size, (iy + 1) * size)
+            if not _cell_touches(aoi, cell):
+                continue
+            tiles.append(Tile(ix=ix, iy=iy, size=size, inside=_cell_inside(aoi, cell)))
+    return tiles
+
+
+def _point_in_aoi(aoi, x, y):
+    # even-odd rule atas semua ring, jadi lubang (holes) ikut diperhitungkan
+    inside = False
+    for ring in aoi.rings:
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+            if (y1 > y) != (y2 > y):
+                if x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+    return inside
+
+
+def _edge_enters(a, b, cell):
+    """True bila segmen a-b melewati interior (terbuka) sel."""
+    west, south, east, north = cell
+    (x1, y1), (x2, y2) = a, b
+    dx, dy = x2 - x1, y2 - y1
+
+    # Liang-Barsky: potong segmen ke persegi sel
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - west), (dx, east - x1), (-dy, y1 - south), (dy, north - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+
+    # titik tengah potongan ada di interior kecuali potongan menempel di tepi sel
+    tm = (t0 + t1) / 2
+    x, y = x1 + tm * dx, y1 + tm * dy
+    return west < x < east and south < y < north
+
+
+def _boundary_enters(aoi, cell):
+    return any(
+        _edge_enters(a, b, cell)
+        for ring in aoi.rings
+        for a, b in zip(ring, ring[1:] + ring[:1])
+    )
+
+
+def _cell_center_inside(aoi, cell):
+    west, south, east, north = cell
+    return _point_in_aoi(aoi, (west + east) / 2, (south + north) / 2)
+
+
+# Bila batas AOI tidak melewati interior sel, seluruh interior sel berada di
+# satu sisi batas, jadi cukup periksa titik tengahnya.
+def _cell_touches(aoi, cell):
+    """True bila interior sel beririsan dengan AOI."""
+    return _boundary_enters(aoi, cell) or _cell_center_inside(aoi, cell)
+
+
+def _cell_inside(aoi, cell):
+    """True bila sel seluruhnya berada di dalam AOI."""
+    return not _boundary_enters(aoi, cell) and _cell_center_inside(aoi, cell)
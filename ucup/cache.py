@@ -0,0 +1,59 @@
+"""Small JSON result cache shared by the pages (memory + disk)."""
+
+import hashlib
+import json
+import os
+import threading
+
+CACHE_DIR = os.environ.get("UCUP_CACHE_DIR", os.path.join(".cache", "ucup"))
+
+_memory = {}
+_lock = threading.Lock()
+
+
+def make_key(*parts):
+    """Stable hex key from any JSON-serialisable parts."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def get(key, default=None):
+    with _lock:
+        if key in _memory:
+            return _memory[key]
+
+    try:
+        with open(_path(key), "r", encoding="utf-8") as fp:
+            value = json.load(fp)
+    except (OSError, ValueError):
+        return default
+
+    with _lock:
+        _memory[key] = value
+    return value
+
+
+def put(key, value):
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # tulis ke file sementara dulu supaya pembaca lain tidak melihat file setengah jadi
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(value, fp)
+    os.replace(tmp_path, path)
+
+    with _lock:
+        _memory[key] = value
+    return value
+
+
+def get_or_compute(key, compute):
+    value = get(key)
+    if value is None:
+        value = put(key, compute())
+    return value
@@ -0,0 +1,79 @@
+"""Append-only chat history for the AI Assistant, stored in SQLite.
+
+Satu baris per pesan, primary key ``(session_id, seq)`` sehingga mengambil
+jendela pesan terakhir cukup satu range scan di index, tanpa membaca seluruh
+percakapan. Pesan tidak pernah diubah atau dihapus; "Reset" di halaman cukup
+memulai session ID baru.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from ucup import cache
+
+DEFAULT_PATH = os.path.join(cache.CACHE_DIR, "chat.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    role       TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    created    REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID
+"""
+
+
+class ChatStore:
+    def __init__(self, path=DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # satu koneksi dipakai bersama semua sesi Streamlit, dijaga oleh _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def append(self, session_id, *messages):
+        """Tambah satu atau lebih pesan ``{"role", "content"}`` secara atomik."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (last,) = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM messages WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT INTO messages (session_id, seq, role, content, created) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (session_id, last + i, msg["role"], msg["content"], now)
+                        for i, msg in enumerate(messages, start=1)
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def count(self, session_id):
+        with self._lock:
+            (n,) = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return n
+
+    def tail(self, session_id, limit=None):
+        """``limit`` pesan terakhir (semua bila None), urut dari yang paling lama."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+                (session_id, -1 if limit is None else limit),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
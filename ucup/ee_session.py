@@ -0,0 +1,98 @@
+"""One Earth Engine session per process, shared by every page and the API.
+
+Kredensial dibuat langsung dari JSON service account di memori (tanpa file
+sementara), dan semua request EE lewat satu transport HTTP keep-alive dengan
+connection pool, sehingga thread pool di ``ucup.zonal`` aman dan tidak membuka
+koneksi TLS baru untuk tiap tile.
+"""
+
+import json
+import os
+import threading
+
+SECRETS_FILE = os.path.join(".streamlit", "secrets.toml")
+POOL_SIZE = 16
+TIMEOUT = 300
+
+_lock = threading.Lock()
+_initialized = False
+
+
+# TRANSPORT HTTP (httplib2-compatible, di atas requests.Session)
+class PooledHttp:
+    def __init__(self, pool_size=POOL_SIZE, timeout=TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None, **kwargs):
+        import httplib2
+
+        resp = self.session.request(
+            method,
+            uri,
+            data=body,
+            headers=headers,
+            timeout=self.timeout,
+            allow_redirects=redirections > 0,
+        )
+        info = dict(resp.headers)
+        info["status"] = str(resp.status_code)
+        response = httplib2.Response(info)
+        response.reason = resp.reason
+        return response, resp.content
+
+    def close(self):
+        self.session.close()
+
+
+def init_ee(sa_json_str):
+    """Inisialisasi EE sekali per proses; panggilan berikutnya langsung kembali."""
+    global _initialized
+    if _initialized:
+        return
+
+    with _lock:
+        if _initialized:
+            return
+
+        import ee
+
+        sa_info = json.loads(sa_json_str)
+        credentials = ee.ServiceAccountCredentials(
+            email=sa_info["client_email"],
+            key_data=sa_json_str,
+        )
+        ee.Initialize(
+            credentials,
+            project=sa_info["project_id"],
+            http_transport=PooledHttp(),
+        )
+        _initialized = True
+
+
+# HALAMAN STREAMLIT
+def init_ee_service_account():
+    import streamlit as st
+
+    try:
+        init_ee(st.secrets["gee"]["service_account_json"])
+    except Exception as e:
+        st.error(f"❌ Gagal menginisialisasi Google Earth Engine:\n\n{e}")
+        st.stop()
+
+
+# TANPA STREAMLIT (api.py): env var atau secrets.toml yang sama
+def init_ee_headless():
+    sa_json_str = os.environ.get("GEE_SERVICE_ACCOUNT_JSON")
+    if not sa_json_str:
+        import tomllib  # Python 3.11+, hanya dibutuhkan di jalur API
+
+        with open(SECRETS_FILE, "rb") as fp:
+            sa_json_str = tomllib.load(fp)["gee"]["service_account_json"]
+    init_ee(sa_json_str)
@@ -0,0 +1,159 @@
+"""Flood Hazard Index (Landsat 8, SRTM, JRC GSW) shared by the dashboard page and the API."""
+
+import ee
+
+from ucup.zonal import zonal_histogram
+
+YEARS = [2020, 2021, 2022, 2023, 2024]
+
+rainbow = ["blue", "cyan", "green", "yellow", "red"]
+
+# CLOUD MASK FOR LANDSAT 8
+def cloudMask(image):
+    qa = image.select("QA_PIXEL")
+    dilated = 1 << 1
+    cirrus = 1 << 2
+    cloud = 1 << 3
+    shadow = 1 << 4
+
+    mask = (
+        qa.bitwiseAnd(dilated).eq(0)
+        .And(qa.bitwiseAnd(cirrus).eq(0))
+        .And(qa.bitwiseAnd(cloud).eq(0))
+        .And(qa.bitwiseAnd(shadow).eq(0))
+    )
+
+    return (
+        image
+        .select(["SR_B.*"], ["B1", "B2", "B3", "B4", "B5", "B6", "B7"])
+        .multiply(0.0000275)
+        .add(-0.2)
+        .updateMask(mask)
+    )
+
+# GENERATE FLOOD HAZARD
+def compute_flood_hazard(aoi, selected_year):
+    # LOAD DATASETS (dibuat di sini karena ee.Image butuh ee.Initialize lebih dulu)
+    gsw = ee.Image("JRC/GSW1_4/GlobalSurfaceWater")
+    srtm = ee.Image("USGS/SRTMGL1_003")
+    l8 = ee.ImageCollection("LANDSAT/LC08/C02/T1_L2")
+
+    water = gsw.select("occurrence").clip(aoi)
+    permanent = water.gt(80)
+
+    distance = permanent.fastDistanceTransform().divide(30).clip(aoi)
+    only_distance = distance.updateMask(distance.neq(0).And(srtm.mask()))
+
+    distanceScore = (
+        only_distance
+        .where(only_distance.gt(4000), 1)
+        .where(only_distance.gt(3000).And(only_distance.lte(4000)), 2)
+        .where(only_distance.gt(2000).And(only_distance.lte(3000)), 3)
+        .where(only_distance.gt(1000).And(only_distance.lte(2000)), 4)
+        .where(only_distance.lte(1000), 5)
+    )
+
+    elev = srtm.clip(aoi)
+    elevScore = (
+        elev.updateMask(distance.neq(0))
+        .where(elev.gt(20), 1)
+        .where(elev.gt(15).And(elev.lte(20)), 2)
+        .where(elev.gt(10).And(elev.lte(15)), 3)
+        .where(elev.gt(5).And(elev.lte(10)), 4)
+        .where(elev.lte(5), 5)
+    )
+
+    tpi = elev.subtract(elev.focalMean(5))
+    topoScore = (
+        tpi.updateMask(distance.neq(0))
+        .where(tpi.gt(0), 1)
+        .where(tpi.gt(-2).And(tpi.lte(0)), 2)
+        .where(tpi.gt(-4).And(tpi.lte(-2)), 3)
+        .where(tpi.gt(-6).And(tpi.lte(-4)), 4)
+        .where(tpi.lte(-8), 5)
+    )
+
+    landsat = (
+        l8.filterBounds(aoi)
+        .filterDate(f"{selected_year}-01-01", f"{selected_year}-12-31")
+        .map(cloudMask)
+        .median()
+        .clip(aoi)
+    )
+
+    RED = landsat.select("B4")
+    NIR = landsat.select("B5")
+    GREEN = landsat.select("B3")
+
+    ndvi = (NIR.subtract(RED)).divide(NIR.add(RED)).rename("NDVI")
+    ndwi = (GREEN.subtract(NIR)).divide(GREEN.add(NIR)).rename("NDWI")
+
+    vegScore = (
+        ndvi.updateMask(distance.neq(0))
+        .where(ndvi.gt(0.8), 1)
+        .where(ndvi.gt(0.6).And(ndvi.lte(0.8)), 2)
+        .where(ndvi.gt(0.4).And(ndvi.lte(0.6)), 3)
+        .where(ndvi.gt(0.2).And(ndvi.lte(0.4)), 4)
+        .where(ndvi.lte(0.2), 5)
+    )
+
+    wetScore = (
+        ndwi.updateMask(distance.neq(0))
+        .where(ndwi.gt(0.6), 5)
+        .where(ndwi.gt(0.2).And(ndwi.lte(0.6)), 4)
+        .where(ndwi.gt(-0.2).And(ndwi.lte(0.2)), 3)
+        .where(ndwi.gt(-0.6).And(ndwi.lte(-0.2)), 2)
+        .where(ndwi.lte(-0.6), 1)
+    )
+
+    floodHazard = (
+        distanceScore
+        .add(topoScore)
+        .add(vegScore)
+        .add(wetScore)
+        .add(elevScore)
+        .rename("FHI")
+    )
+
+    floodScore = (
+        floodHazard
+        .where(floodHazard.gt(15), 5)
+        .where(floodHazard.gt(10).And(floodHazard.lte(15)), 4)
+        .where(floodHazard.gt(5).And(floodHazard.lte(10)), 3)
+        .where(floodHazard.gt(0).And(floodHazard.lte(5)), 2)
+        .where(floodHazard.lte(0), 1)
+    )
+
+    return {
+        "distance": only_distance,
+        "distanceScore": distanceScore,
+        "ndvi": ndvi,
+        "ndwi": ndwi,
+        "vegScore": vegScore,
+        "wetScore": wetScore,
+        "tpi": tpi,
+        "topoScore": topoScore,
+        "elevScore": elevScore,
+        "floodHazard": floodHazard,
+        "floodScore": floodScore,
+    }
+
+
+# JUMLAH PIKSEL PER KELAS FHI (1–5)
+def flood_class_counts(aoi_info, year):
+    result = compute_flood_hazard(aoi_info.ee_geometry(), year)
+    # distance transform & focalMean bergantung pada clip AOI, jadi AOI ikut di key
+    hist = zonal_histogram(
+        result["floodScore"], "FHI", aoi_info,
+        image_key=f"fhi_score:{aoi_info.fingerprint}:{year}",
+        lo=0.5, hi=5.5, buckets=5,
+        scale=30,
+    )
+    return [
+        {"year": year, "class": cls, "pixels": count}
+        for cls, count in zip(range(1, 6), hist["histogram"])
+    ]
+
+
+def flood_class_counts_by_year(aoi_info, years=YEARS):
+    return [row for yr in years for row in flood_class_counts(aoi_info, yr)]
@@ -0,0 +1,217 @@
+"""Process-wide gateway to the Groq chat API for the AI Assistant page.
+
+Semua sesi Streamlit berbagi satu gateway:
+
+- satu ``AsyncGroq`` client yang dipakai ulang, berjalan di event loop sendiri
+  (thread latar belakang);
+- antrian terbatas (``max_queue``); bila penuh, ``submit`` langsung menolak
+  dengan ``GatewayBusy`` daripada menumpuk request;
+- token bucket untuk request/menit dan token/menit sesuai tier API;
+- antrian per sesi yang dilayani bergiliran (round-robin), jadi satu sesi yang
+  rajin bertanya tidak memblokir sesi lain;
+- ``metrics()`` untuk kedalaman antrian dan waktu tunggu.
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+# Default tier gratis Groq untuk llama-3.3-70b-versatile
+DEFAULT_RPM = 30
+DEFAULT_TPM = 12000
+COMPLETION_ESTIMATE = 512  # perkiraan token jawaban sebelum usage diketahui
+
+
+class GatewayBusy(Exception):
+    pass
+
+
+# TOKEN BUCKET
+class TokenBucket:
+    def __init__(self, per_minute, burst=None):
+        # burst = isi maksimum bucket; default satu menit penuh
+        self.capacity = float(burst if burst is not None else per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount):
+        """Detik sampai ``amount`` tersedia (0 bila sudah tersedia)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self._refill()
+        # boleh negatif: koreksi usage sebenarnya menjadi "utang" untuk request berikutnya
+        self.tokens -= amount
+
+
+@dataclass
+class _Job:
+    session_id: str
+    kwargs: dict
+    estimate: int
+    future: Future = field(default_factory=Future)
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+def estimate_tokens(messages):
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 4 + COMPLETION_ESTIMATE
+
+
+# GATEWAY
+class LlmGateway:
+    def __init__(
+        self,
+        api_key,
+        base_url=None,
+        rpm=DEFAULT_RPM,
+        tpm=DEFAULT_TPM,
+        max_queue=64,
+        concurrency=4,
+        max_retries=2,
+        burst=None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+
+        self._requests = TokenBucket(rpm, burst)
+        self._tokens = TokenBucket(tpm)
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # session_id -> deque[_Job], urutan = giliran
+        self._size = 0
+        self._in_flight = 0
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self._waits = deque(maxlen=500)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-gateway", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    async def _start(self):
+        from groq import AsyncGroq
+
+        # client dibuat di dalam loop gateway supaya koneksi httpx terikat ke loop ini
+        self._client = AsyncGroq(api_key=self.api_key, base_url=self.base_url, max_retries=self.max_retries)
+        self._wakeup = asyncio.Event()
+        self._limiter = asyncio.Lock()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    # API (dipanggil dari thread Streamlit)
+    def submit(self, session_id, **kwargs):
+        """Antrikan ``chat.completions.create(**kwargs)``; kembalikan concurrent Future."""
+        job = _Job(session_id=session_id, kwargs=kwargs, estimate=estimate_tokens(kwargs.get("messages", [])))
+        with self._lock:
+            if self._size >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise GatewayBusy(f"antrian penuh ({self.max_queue} request)")
+            self._sessions.setdefault(session_id, deque()).append(job)
+            self._size += 1
+            self._counts["submitted"] += 1
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+        return job.future
+
+    def metrics(self):
+        with self._lock:
+            waits = list(self._waits)
+            result = {
+                "queue_depth": self._size,
+                "sessions_waiting": len(self._sessions),
+                "in_flight": self._in_flight,
+                **self._counts,
+            }
+        result["wait_ms_avg"] = statistics.fmean(waits) if waits else 0.0
+        result["wait_ms_p95"] = statistics.quantiles(waits, n=20)[-1] if len(waits) >= 2 else result["wait_ms_avg"]
+        return result
+
+    def close(self):
+        async def _stop():
+            for task in self._workers:
+                task.cancel()
+            await self._client.close()
+
+        asyncio.run_coroutine_threadsafe(_stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    # WORKER
+    def _next_job(self):
+        with self._lock:
+            if not self._sessions:
+                return None
+            # ambil dari sesi paling depan lalu pindahkan sesi itu ke belakang (round-robin)
+            session_id, jobs = self._sessions.popitem(last=False)
+            job = jobs.popleft()
+            if jobs:
+                self._sessions[session_id] = jobs
+            self._size -= 1
+            self._in_flight += 1
+            return job
+
+    async def _acquire(self, estimate):
+        async with self._limiter:
+            while True:
+                wait = max(self._requests.delay(1), self._tokens.delay(estimate))
+                if wait <= 0:
+                    self._requests.take(1)
+                    self._tokens.take(estimate)
+                    return
+                await asyncio.sleep(wait)
+
+    async def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                job = self._next_job()
+                if job is None:
+                    await self._wakeup.wait()
+                    continue
+
+            if not job.future.set_running_or_notify_cancel():
+                # pemanggil sudah membatalkan sebelum giliran tiba
+                with self._lock:
+                    self._in_flight -= 1
+                continue
+
+            try:
+                await self._acquire(job.estimate)
+                with self._lock:
+                    self._waits.append((time.monotonic() - job.enqueued) * 1000)
+
+                response = await self._client.chat.completions.create(**job.kwargs)
+
+                usage = getattr(response, "usage", None)
+                if usage is not None and usage.total_tokens:
+                    self._tokens.take(usage.total_tokens - job.estimate)
+            except asyncio.CancelledError:
+                job.future.set_exception(RuntimeError("gateway ditutup"))
+                raise
+            except Exception as e:
+                with self._lock:
+                    self._counts["failed"] += 1
+                    self._in_flight -= 1
+                job.future.set_exception(e)
+            else:
+                with self._lock:
+                    self._counts["completed"] += 1
+                    self._in_flight -= 1
+                job.future.set_result(response)
@@ -0,0 +1,80 @@
+"""Mangrove cover (MVI, Sentinel-2) shared by the dashboard page and the API."""
+
+import ee
+
+from ucup.zonal import zonal_sum
+
+YEARS = [2020, 2021, 2022, 2023, 2024]
+DEFAULT_MIN_MVI = 2.50
+DEFAULT_MAX_MVI = 20.00
+
+mvi_vis = {"min": -1, "max": 6, "palette": ["purple", "blue", "cyan", "green", "yellow", "red"]}
+mangrove_vis = {"palette": ["#00FF00"]}
+
+
+# GET MVI FUNCTION
+def get_mvi(aoi, year, min_mvi=DEFAULT_MIN_MVI, max_mvi=DEFAULT_MAX_MVI):
+    start = f"{year}-05-01"
+    end = f"{year}-09-30"
+
+    s2 = (
+        ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
+        .filterBounds(aoi)
+        .filterDate(start, end)
+        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20))
+        .median()
+        .clip(aoi)
+    )
+
+    green = s2.select("B3")
+    nir = s2.select("B8")
+    swir1 = s2.select("B11")
+
+    mvi = nir.subtract(green).divide(swir1.subtract(green).add(1e-6)).rename("MVI")
+
+    mask_map = mvi.gte(min_mvi).And(mvi.lte(max_mvi)).selfMask()
+    mask_area = mvi.gte(min_mvi).And(mvi.lte(max_mvi)).rename("mask").uint8()
+
+    return mvi, mask_map, mask_area
+
+
+# CALC AREA FUNCTION
+# dihitung per tile grid secara paralel & di-cache (lihat ucup/zonal.py)
+def calc_area(mask, aoi_info, key):
+    area = zonal_sum(
+        mask.multiply(ee.Image.pixelArea()),
+        "mask",
+        aoi_info,
+        image_key=key,
+        scale=10,
+    )
+    return area / 10000  # m² → ha
+
+
+def mask_key(year, min_mvi, max_mvi):
+    return f"mvi_mask:{year}:{min_mvi}:{max_mvi}"
+
+
+# RINGKASAN UNTUK API
+def area_by_year(aoi_info, years=YEARS, min_mvi=DEFAULT_MIN_MVI, max_mvi=DEFAULT_MAX_MVI):
+    aoi = aoi_info.ee_geometry()
+    rows = []
+    for yr in years:
+        _, _, mask_area = get_mvi(aoi, yr, min_mvi, max_mvi)
+        rows.append({"year": yr, "area_ha": calc_area(mask_area, aoi_info, mask_key(yr, min_mvi, max_mvi))})
+    return rows
+
+
+def loss_gain(aoi_info, start, end, min_mvi=DEFAULT_MIN_MVI, max_mvi=DEFAULT_MAX_MVI):
+    aoi = aoi_info.ee_geometry()
+    _, _, mask_start = get_mvi(aoi, start, min_mvi, max_mvi)
+    _, _, mask_end = get_mvi(aoi, end, min_mvi, max_mvi)
+
+    loss_mask = mask_start.And(mask_end.Not()).uint8()
+    gain_mask = mask_end.And(mask_start.Not()).uint8()
+
+    suffix = f"{start}:{end}:{min_mvi}:{max_mvi}"
+    return [
+        {"change": "LOSS", "start": start, "end": end, "area_ha": calc_area(loss_mask, aoi_info, f"mvi_loss:{suffix}")},
+        {"change": "GAIN", "start": start, "end": end, "area_ha": calc_area(gain_mask, aoi_info, f"mvi_gain:{suffix}")},
+    ]
@@ -0,0 +1,133 @@
+"""Local raster cache: AOI rasters stored as memory-mapped ``.npy`` files.
+
+Raster diambil sekali dari Earth Engine (``ee.data.computePixels``) di grid
+EPSG:4326 di atas bounding box AOI, lalu disimpan sebagai float32 dengan NaN
+untuk piksel yang ter-mask. Metadata (bounds, resolusi, vis params) disimpan di
+file ``.json`` di sebelahnya sehingga renderer tile (``ucup.tiles``) bisa bekerja
+tanpa Earth Engine sama sekali.
+"""
+
+import json
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ucup import cache
+
+RASTER_DIR = os.path.join(cache.CACHE_DIR, "rasters")
+CHUNK = 1024  # piksel per sisi untuk satu request computePixels
+NODATA = -9999.0
+MAX_WORKERS = 8
+METERS_PER_DEGREE = 111320.0
+
+_open = {}
+_lock = threading.Lock()
+
+
+def raster_id(aoi_info, image_key, scale):
+    return cache.make_key("raster", aoi_info.fingerprint, image_key, scale)
+
+
+def _paths(rid):
+    base = os.path.join(RASTER_DIR, rid)
+    return f"{base}.npy", f"{base}.json"
+
+
+def has_raster(rid):
+    npy_path, meta_path = _paths(rid)
+    return os.path.exists(npy_path) and os.path.exists(meta_path)
+
+
+def load_raster(rid):
+    """(memmap, meta) atau KeyError bila raster belum ada di cache."""
+    with _lock:
+        if rid in _open:
+            return _open[rid]
+
+    if not has_raster(rid):
+        raise KeyError(rid)
+
+    npy_path, meta_path = _paths(rid)
+    with open(meta_path, "r", encoding="utf-8") as fp:
+        meta = json.load(fp)
+    data = np.load(npy_path, mmap_mode="r")
+
+    with _lock:
+        _open[rid] = (data, meta)
+    return data, meta
+
+
+def _fetch_chunk(image, west, north, res, col, row, width, height):
+    import ee
+
+    pixels = ee.data.computePixels({
+        "expression": image,
+        "fileFormat": "NUMPY_NDARRAY",
+        "grid": {
+            "dimensions": {"width": width, "height": height},
+            "affineTransform": {
+                "scaleX": res,
+                "shearX": 0,
+                "translateX": west + col * res,
+                "shearY": 0,
+                "scaleY": -res,
+                "translateY": north - row * res,
+            },
+            "crsCode": "EPSG:4326",
+        },
+    })
+    values = pixels[pixels.dtype.names[0]].astype(np.float32)
+    values[values == NODATA] = np.nan
+    return values
+
+
+def ensure_raster(aoi_info, image, image_key, vis, scale=10):
+    """Unduh ``image`` (satu band) ke cache lokal bila belum ada; kembalikan id raster."""
+    rid = raster_id(aoi_info, image_key, scale)
+    if has_raster(rid):
+        return rid
+
+    west, south, east, north = aoi_info.bounds
+    res = scale / METERS_PER_DEGREE
+    width = max(1, math.ceil((east - west) / res))
+    height = max(1, math.ceil((north - south) / res))
+
+    single = image.select([0]).toFloat().unmask(NODATA)
+
+    npy_path, meta_path = _paths(rid)
+    os.makedirs(RASTER_DIR, exist_ok=True)
+    tmp_path = f"{npy_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    data = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(height, width))
+
+    def run(origin):
+        row, col = origin
+        h = min(CHUNK, height - row)
+        w = min(CHUNK, width - col)
+        data[row:row + h, col:col + w] = _fetch_chunk(single, west, north, res, col, row, w, h)
+
+    origins = [(r, c) for r in range(0, height, CHUNK) for c in range(0, width, CHUNK)]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(origins))) as pool:
+        list(pool.map(run, origins))
+
+    data.flush()
+    del data
+    os.replace(tmp_path, npy_path)
+
+    meta = {
+        "aoi": aoi_info.name,
+        "image_key": image_key,
+        "west": west,
+        "north": north,
+        "res": res,
+        "width": width,
+        "height": height,
+        "vis": vis,
+    }
+    tmp_meta = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as fp:
+        json.dump(meta, fp)
+    os.replace(tmp_meta, meta_path)
+    return rid
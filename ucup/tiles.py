@@ -0,0 +1,109 @@
+"""XYZ PNG tiles rendered from the local raster cache (``ucup.rasters``).
+
+Palet dan min/max diambil dari vis params yang disimpan bersama raster, yaitu
+vis params yang sama dengan yang dipakai halaman (``rainbow``, ``ndwi_vis``,
+``ndti_vis``, ...). Warna diinterpolasi linear seperti palet Earth Engine.
+Tile yang sudah di-encode disimpan di LRU di memori.
+"""
+
+import struct
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from ucup import rasters
+
+TILE_SIZE = 256
+MAX_ZOOM = 24
+LRU_SIZE = 4096
+
+CSS_COLORS = {
+    "black": "000000",
+    "white": "ffffff",
+    "red": "ff0000",
+    "green": "008000",
+    "blue": "0000ff",
+    "cyan": "00ffff",
+    "yellow": "ffff00",
+    "orange": "ffa500",
+    "purple": "800080",
+}
+
+
+# PALET
+def _rgb(color):
+    color = CSS_COLORS.get(color.lower(), color).lstrip("#")
+    return [int(color[i:i + 2], 16) for i in (0, 2, 4)]
+
+
+def colorize(values, vis):
+    """float array (NaN = transparan) → RGBA uint8."""
+    palette = np.array([_rgb(c) for c in vis.get("palette", ["black", "white"])], dtype=np.float32)
+    lo = vis.get("min", 0)
+    hi = vis.get("max", 1)
+
+    valid = ~np.isnan(values)
+    t = np.clip((np.nan_to_num(values) - lo) / ((hi - lo) or 1), 0, 1) * (len(palette) - 1)
+    i0 = np.floor(t).astype(np.int64)
+    i1 = np.minimum(i0 + 1, len(palette) - 1)
+    frac = (t - i0)[..., None]
+
+    rgba = np.zeros(values.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = np.rint(palette[i0] * (1 - frac) + palette[i1] * frac).astype(np.uint8)
+    rgba[..., 3] = np.where(valid, 255, 0)
+    return rgba
+
+
+# PNG (tanpa dependensi tambahan)
+def encode_png(rgba):
+    height, width, _ = rgba.shape
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    # byte filter 0 di awal tiap baris
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, width * 4)], axis=1)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+EMPTY_TILE = encode_png(np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8))
+
+
+# RENDER
+def valid_tile(z, x, y):
+    n = 2 ** z if 0 <= z <= MAX_ZOOM else 0
+    return 0 <= x < n and 0 <= y < n
+
+
+def _tile_lonlat(z, x, y):
+    n = 2 ** z
+    steps = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    lon = (x + steps) / n * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + steps) / n))))
+    return lon, lat
+
+
+@lru_cache(maxsize=LRU_SIZE)
+def render_tile(rid, z, x, y):
+    """PNG bytes untuk tile XYZ (Web Mercator); KeyError bila raster tidak ada."""
+    data, meta = rasters.load_raster(rid)
+    lon, lat = _tile_lonlat(z, x, y)
+
+    cols = np.floor((lon - meta["west"]) / meta["res"]).astype(np.int64)
+    rows = np.floor((meta["north"] - lat) / meta["res"]).astype(np.int64)
+    col_ok = (cols >= 0) & (cols < meta["width"])
+    row_ok = (rows >= 0) & (rows < meta["height"])
+    if not col_ok.any() or not row_ok.any():
+        return EMPTY_TILE
+
+    # nearest neighbour: baca hanya baris/kolom yang dibutuhkan dari memmap
+    values = np.full((TILE_SIZE, TILE_SIZE), np.nan, dtype=np.float32)
+    window = data[np.ix_(rows[row_ok], cols[col_ok])]
+    values[np.ix_(row_ok, col_ok)] = window
+    return encode_png(colorize(values, meta["vis"]))
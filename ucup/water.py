@@ -0,0 +1,63 @@
+"""NDWI / NDTI (Sentinel-2) shared by the dashboard page and the API."""
+
+import ee
+
+from ucup.zonal import zonal_histogram
+
+YEARS = [2020, 2021, 2022, 2023, 2024]
+DEFAULT_CLOUD_LIMIT = 10
+
+ndwi_vis = {"min": -0.5, "max": 0.5, "palette": ["red", "white", "blue"]}
+ndti_vis = {"min": -0.5, "max": 0.5, "palette": ["blue", "green", "yellow", "orange", "red"]}
+
+# bucket tetap (-1..1) supaya histogram per tile bisa digabung persis
+NDTI_HIST_RANGE = (-1.0, 1.0)
+NDTI_HIST_BUCKETS = 40
+
+
+# AMBIL NDWI & NDTI
+def get_ndwi_ndti(aoi, year, cloud_limit=DEFAULT_CLOUD_LIMIT):
+    s2 = (
+        ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
+        .filterBounds(aoi)
+        .filterDate(f"{year}-01-01", f"{year}-12-31")
+        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", cloud_limit))
+        .median()
+        .clip(aoi)
+    )
+
+    green = s2.select("B3")
+    red   = s2.select("B4")
+    nir   = s2.select("B8")
+
+    ndwi = green.subtract(nir).divide(green.add(nir).add(1e-6)).rename("NDWI")
+
+    watermask = ndwi.gt(0).rename("watermask")
+
+    ndti = red.subtract(green).divide(red.add(green).add(1e-6)).rename("NDTI")
+    ndti_water = ndti.updateMask(watermask).clip(aoi)
+
+    return ndwi, ndti_water, watermask
+
+
+# HISTOGRAM NDTI
+def ndti_histogram(ndti_img, aoi_info, year, cloud_limit=DEFAULT_CLOUD_LIMIT):
+    lo, hi = NDTI_HIST_RANGE
+    return zonal_histogram(
+        ndti_img, "NDTI", aoi_info,
+        image_key=f"ndti:{year}:{cloud_limit}",
+        lo=lo, hi=hi, buckets=NDTI_HIST_BUCKETS,
+        scale=10,
+    )
+
+
+# RINGKASAN UNTUK API
+def ndti_histogram_by_year(aoi_info, years=YEARS, cloud_limit=DEFAULT_CLOUD_LIMIT):
+    aoi = aoi_info.ee_geometry()
+    rows = []
+    for yr in years:
+        _, ndti_img, _ = get_ndwi_ndti(aoi, yr, cloud_limit)
+        hist = ndti_histogram(ndti_img, aoi_info, yr, cloud_limit)
+        for mean, count in zip(hist["bucketMeans"], hist["histogram"]):
+            rows.append({"year": yr, "ndti": mean, "count": count})
+    return rows
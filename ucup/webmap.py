@@ -0,0 +1,124 @@
+"""Folium map for the dashboard pages, without geemap.
+
+Halaman hanya memakai sebagian kecil ``geemap.foliumap.Map`` (layer EE, tile
+layer, GeoJSON, legenda, render ke Streamlit), tetapi ``import geemap`` ikut
+memuat ipyleaflet, bqplot dan IPython, dan itu porsi terbesar waktu buka
+halaman. ``Map`` di sini menyediakan method dengan nama yang sama di atas
+folium biasa. Modul ini diimpor halaman tepat saat peta dibuat, dan
+``ucup.rasters`` (numpy) baru diimpor bila tile lokal dipakai.
+"""
+
+import html
+import logging
+import os
+
+import folium
+from branca.element import Element
+from folium.plugins import Fullscreen
+
+TILE_URL_ENV = "UCUP_TILE_URL"
+
+log = logging.getLogger(__name__)
+
+
+def _ee_tile_url(ee_object, vis):
+    import ee
+
+    # sama seperti geemap: geometri digambar sebagai outline + isi transparan
+    if isinstance(ee_object, (ee.Geometry, ee.Feature, ee.FeatureCollection)):
+        features = ee.FeatureCollection(ee_object)
+        color = vis.get("color", "000000")
+        outline = features.style(color=color, fillColor="00000000", width=vis.get("width", 2))
+        image = features.style(fillColor=color).updateMask(ee.Image.constant(0.5)).blend(outline)
+        vis = {}
+    elif isinstance(ee_object, ee.ImageCollection):
+        image = ee_object.mosaic()
+    else:
+        image = ee_object
+    return ee.Image(image).getMapId(vis)["tile_fetcher"].url_format
+
+
+class Map(folium.Map):
+    def __init__(self, center, zoom, **kwargs):
+        super().__init__(location=center, zoom_start=zoom, max_zoom=24, **kwargs)
+        Fullscreen().add_to(self)
+
+    def add_basemap(self, basemap):
+        """Basemap dari nama provider xyzservices, mis. ``"CartoDB.DarkMatter"``."""
+        import xyzservices
+
+        folium.TileLayer(xyzservices.providers.query_name(basemap), name=basemap).add_to(self)
+
+    def addLayer(self, ee_object, vis=None, name="Layer"):
+        self.add_tile_layer(_ee_tile_url(ee_object, dict(vis or {})), name, "Google Earth Engine")
+
+    def add_tile_layer(self, url, name, attribution):
+        folium.TileLayer(
+            tiles=url,
+            attr=attribution,
+            name=name,
+            overlay=True,
+            control=True,
+            max_zoom=24,
+        ).add_to(self)
+
+    def add_geojson(self, data, layer_name, style=None):
+        folium.GeoJson(data, name=layer_name, style_function=lambda _: dict(style or {})).add_to(self)
+
+    def add_legend(self, title, legend_dict):
+        rows = "".join(
+            f'<div><span style="display:inline-block;width:12px;height:12px;margin-right:6px;'
+            f'background:{html.escape(color)};border:1px solid #999"></span>{html.escape(label)}</div>'
+            for label, color in legend_dict.items()
+        )
+        self.get_root().html.add_child(Element(
+            '<div style="position:fixed;bottom:20px;right:5px;z-index:9999;padding:10px;'
+            'font-size:14px;background:rgba(255,255,255,0.8);border:2px solid grey;border-radius:5px">'
+            f"<b>{html.escape(title)}</b>{rows}</div>"
+        ))
+
+    def to_html(self):
+        folium.LayerControl().add_to(self)
+        return self.get_root().render()
+
+    def to_streamlit(self, height=600):
+        import streamlit.components.v1 as components
+
+        return components.html(self.to_html(), height=height)
+
+
+# LAYER: tile lokal (UCUP_TILE_URL) bila tersedia, kalau tidak lewat EE
+def tile_server_url():
+    return os.environ.get(TILE_URL_ENV, "").rstrip("/")
+
+
+def add_layer(m, aoi_info, image, image_key, vis, name, scale=10):
+    base = tile_server_url()
+    if base:
+        from ucup import rasters
+
+        try:
+            rid = rasters.ensure_raster(aoi_info, image, image_key, vis, scale=scale)
+        except Exception:
+            # jatuh ke layer EE biasa, tapi jangan sembunyikan kenapa cache raster gagal
+            log.exception("raster lokal untuk %s (%s) gagal dibuat", name, image_key)
+            rid = None
+        if rid is not None:
+            m.add_tile_layer(
+                url=f"{base}/tiles/{rid}/{{z}}/{{x}}/{{y}}.png",
+                name=name,
+                attribution="UCUP",
+            )
+            return
+    m.addLayer(image, vis, name)
+
+
+def add_aoi_outline(m, aoi_info, color, name="AOI"):
+    if tile_server_url():
+        m.add_geojson(
+            {"type": "Feature", "properties": {}, "geometry": aoi_info.geometry},
+            layer_name=name,
+            style={"color": color, "fillOpacity": 0},
+        )
+    else:
+        m.addLayer(aoi_info.ee_geometry(), {"color": color}, name)
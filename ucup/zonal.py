@@ -0,0 +1,90 @@
+"""Tiled, parallel zonal statistics over registry AOIs.
+
+Setiap AOI dipecah menjadi sel grid (lihat ``ucup.aoi.split_tiles``), tiap sel
+direduksi secara paralel, lalu hasilnya digabung:
+
+- ``zonal_sum``       → jumlah per sel dijumlahkan
+- ``zonal_histogram`` → ``fixedHistogram`` dengan bucket yang sama di semua sel,
+                        sehingga count per bucket bisa dijumlahkan persis
+
+Hasil per sel disimpan di ``ucup.cache``. Sel yang seluruhnya berada di dalam
+AOI di-key tanpa AOI, jadi AOI yang tumpang tindih memakai ulang hasilnya.
+``image_key`` harus mengidentifikasi isi citra (mis. ``"mvi_mask:2020:2.5:20"``)
+dan tidak boleh bergantung pada AOI selain lewat ``clip``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import ee
+
+from ucup import cache
+from ucup.aoi import TILE_DEG, split_tiles
+
+MAX_WORKERS = 8
+MAX_PIXELS = 1e13
+
+
+def _tile_region(aoi, tile):
+    if tile.inside:
+        return tile.ee_rectangle()
+    return aoi.ee_geometry().intersection(tile.ee_rectangle(), 1)
+
+
+def _tile_key(kind, aoi, tile, image_key, params):
+    scope = None if tile.inside else aoi.fingerprint
+    return cache.make_key("zonal", kind, image_key, params, tile.cell_id, scope)
+
+
+def _reduce_tiles(kind, image, band, aoi, image_key, reducer, params, scale, tile_size):
+    def run(tile):
+        key = _tile_key(kind, aoi, tile, image_key, [band, scale, params])
+
+        def compute():
+            value = (
+                image.reduceRegion(
+                    reducer=reducer,
+                    geometry=_tile_region(aoi, tile),
+                    scale=scale,
+                    maxPixels=MAX_PIXELS,
+                )
+                .get(band)
+                .getInfo()
+            )
+            # None disimpan sebagai {"value": None} supaya tetap ter-cache
+            return {"value": value}
+
+        return cache.get_or_compute(key, compute)["value"]
+
+    tiles = split_tiles(aoi, tile_size)
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tiles) or 1)) as pool:
+        return list(pool.map(run, tiles))
+
+
+def zonal_sum(image, band, aoi, image_key, scale=10, tile_size=TILE_DEG):
+    values = _reduce_tiles(
+        "sum", image, band, aoi, image_key, ee.Reducer.sum(), None, scale, tile_size
+    )
+    return float(sum(v for v in values if v is not None))
+
+
+def zonal_histogram(image, band, aoi, image_key, lo, hi, buckets, scale=10, tile_size=TILE_DEG):
+    """Histogram dengan bentuk yang sama seperti ``ee.Reducer.histogram``."""
+    values = _reduce_tiles(
+        "histogram", image, band, aoi, image_key,
+        ee.Reducer.fixedHistogram(lo, hi, buckets), [lo, hi, buckets], scale, tile_size,
+    )
+
+    width = (hi - lo) / buckets
+    counts = [0.0] * buckets
+    for rows in values:
+        if rows is None:
+            continue
+        for i, (_, count) in enumerate(rows):
+            counts[i] += count
+
+    return {
+        "bucketMin": lo,
+        "bucketWidth": width,
+        "bucketMeans": [lo + width * (i + 0.5) for i in range(buckets)],
+        "histogram": counts,
+    }